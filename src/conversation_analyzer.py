@@ -14,21 +14,149 @@ Date: 2025
 """
 
 import argparse
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import pandas as pd
-import urllib.parse
+import logging
+import math
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import reduce
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from collections import defaultdict
-import time
+import csv
+import io
+import sqlite3
+import sys
 import os
 from dotenv import load_dotenv
 
+# HTTP/2 support needs the optional h2 package (the httpx[http2] extra);
+# without it the async client falls back to HTTP/1.1 instead of crashing
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# orjson parses the deeply nested trace payloads ~3x faster than stdlib json
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# pyarrow's C++ CSV writer serializes large exports several times faster
+# than a row-by-row Python writer; fall back to csv.DictWriter when missing
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# polars writes CSV from Rust worker threads, bypassing the GIL; it is
+# preferred over the pyarrow and stdlib writers when installed
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# pysimdjson parses trace payloads lazily: the SIMD structural scan skips
+# unread subtrees, and only the invocationInput leaves are materialized.
+# One reusable parser amortizes its internal buffers across payloads
+try:
+    import simdjson
+    _simdjson_parser = simdjson.Parser()
+except ImportError:
+    simdjson = None
+
+# ijson streams only the invocationInput subtrees out of trace payloads
+# instead of materializing the whole object tree
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# tqdm gives near-zero-cost progress feedback now that per-message
+# status lines are logged at debug level
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+# numba JIT-compiles the numeric top-K selection used by the statistics
+# pass; plain numpy (or pure Python) is used when it is not installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def _topk_indices(counts, k):
+        """Indices of the k largest counts, descending."""
+        return np.argsort(counts)[::-1][:k]
+elif np is not None:
+    def _topk_indices(counts, k):
+        """Indices of the k largest counts, descending."""
+        return np.argsort(counts)[::-1][:k]
+
+# Maximum number of in-flight API requests during concurrent processing
+MAX_CONCURRENT_REQUESTS = 20
+
+# On-disk cache of trace responses, reused across runs
+TRACE_CACHE_PATH = '.trace_cache.sqlite'
+
+# STREAM_CSV=1 writes tool-call rows straight to one CSV as they are
+# extracted instead of accumulating them in memory: constant memory for
+# unbounded runs, at the cost of per-tool files and param columns
+STREAM_CSV = os.environ.get('STREAM_CSV', '').lower() in ('1', 'true', 'yes')
+
+logger = logging.getLogger(__name__)
+
+# The dict keys probed on every trace are interned once so lookups hit
+# CPython's pointer-equality fast path instead of full string comparison
+_K = {name: sys.intern(name) for name in (
+    'trace', 'orchestrationTrace', 'invocationInput',
+    'agentCollaboratorInvocationInput', 'actionGroupInvocationInput',
+    'agentCollaboratorName', 'actionGroupName', 'function', 'parameters',
+    'invocationType', 'executionType', 'name', 'value',
+)}
+
+# Extraction path compiled once; every trace is classified with a single
+# walk along it instead of per-level membership tests
+_INVOCATION_INPUT_PATH = (_K['trace'], _K['orchestrationTrace'], _K['invocationInput'])
+
+
+def _walk(obj: Dict[str, Any],
+          path: Tuple[str, ...] = _INVOCATION_INPUT_PATH) -> Optional[Any]:
+    """Follow a precompiled key path, returning None on any miss."""
+    try:
+        return reduce(dict.get, path, obj)
+    except TypeError:  # an intermediate level was missing
+        return None
+
 
 class ConversationAnalyzer:
     """Main class for analyzing conversations and agent traces."""
-    
+
+    # Fixed attribute layout: instances carry no __dict__, shrinking each
+    # analyzer and turning self.<attr> loads in the parse loop into
+    # C-level offset reads. New instance attributes must be listed here.
+    __slots__ = (
+        'bearer_token', 'project_uuid', 'session',
+        'agent_invocations', 'tool_invocations',
+        'tool_row_count', '_cols', '_param_cols', '_stats_bytes',
+        '_stream_filename', '_stream_file', '_stream_writer',
+        '_trace_cache',
+    )
+
     def __init__(self, bearer_token: str, project_uuid: str):
         """
         Initialize the analyzer with authentication and project information.
@@ -40,10 +168,26 @@ class ConversationAnalyzer:
         self.bearer_token = bearer_token
         self.project_uuid = project_uuid
         self.session = requests.Session()
+
+        # Tune the connection pool so keep-alive sockets are reused across
+        # the thousands of calls this script makes, and retry transient errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=1,
+                status_forcelist=[429, 502, 503, 504],
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount('https://', adapter)
+
         self.session.headers.update({
             'accept': 'application/json, text/plain, */*',
             'accept-language': 'en-US,en;q=0.9,pt-BR;q=0.8,pt;q=0.7,es;q=0.6,nl;q=0.5,fr;q=0.4',
             'authorization': f'Bearer {bearer_token}',
+            'connection': 'keep-alive',
             'origin': 'https://intelligence-next.weni.ai',
             'priority': 'u=1, i',
             'referer': 'https://intelligence-next.weni.ai/supervisor',
@@ -56,11 +200,63 @@ class ConversationAnalyzer:
             'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36'
         })
         
-        # Statistics containers
+        # Statistics containers: defaultdict(int) makes the += 1 increment
+        # a single hashed store, without Counter's subclass dispatch
         self.agent_invocations = defaultdict(int)
         self.tool_invocations = defaultdict(int)
-        self.tool_calls_data = []
-    
+
+        # Tool-call rows are stored column-oriented (struct-of-arrays):
+        # aligned base-column lists plus lazily created, None-padded param
+        # columns. This roughly halves memory versus one dict per row and
+        # hands the columnar CSV writers their buffers directly
+        self.tool_row_count = 0
+        self._cols = {
+            'function_name': [],
+            'action_group_name': [],
+            'execution_type': []
+        }
+        self._param_cols: Dict[str, list] = {}
+
+        # JSON statistics report, encoded once by generate_statistics and
+        # written verbatim by save_statistics_to_file
+        self._stats_bytes: Optional[bytes] = None
+
+        # In streaming mode rows bypass the columnar store and go straight
+        # to disk; tool_row_count stays the O(1) record counter either way
+        self._stream_filename: Optional[str] = None
+        self._stream_file = None
+        self._stream_writer = None
+        if STREAM_CSV:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._stream_filename = f"tool_invocations_{timestamp}.csv"
+            self._stream_file = open(self._stream_filename, 'w', newline='',
+                                     encoding='utf-8', buffering=1 << 20)
+            self._stream_writer = csv.writer(self._stream_file)
+            self._stream_writer.writerow(
+                ['function_name', 'action_group_name', 'execution_type', 'params'])
+
+        # Trace responses are cached by log_id and persisted across runs,
+        # so re-running an overlapping date range skips the HTTP round-trip
+        # — this is also what makes retrying an interrupted run cheap
+        self._trace_cache = sqlite3.connect(TRACE_CACHE_PATH)
+        self._trace_cache.execute(
+            'CREATE TABLE IF NOT EXISTS traces (log_id INTEGER PRIMARY KEY, payload BLOB)')
+
+    def reset(self) -> None:
+        """
+        Clear all collected tallies and tool-call rows.
+
+        Lets one instance — and its pooled HTTP session — be reused
+        across analysis runs or tests without paying for reconstruction.
+        """
+        self.agent_invocations = defaultdict(int)
+        self.tool_invocations = defaultdict(int)
+        self.tool_row_count = 0
+        for values in self._cols.values():
+            values.clear()
+        self._param_cols.clear()
+        self._stats_bytes = None
+
     def get_conversations(self, start_date: str, end_date: str, page: int = 1) -> Dict[str, Any]:
         """
         Get conversations for the specified date range.
@@ -80,153 +276,441 @@ class ConversationAnalyzer:
             'end': end_date
         }
         
-        print(f"Fetching conversations page {page} for dates {start_date} to {end_date}...")
+        logger.info(f"Fetching conversations page {page} for dates {start_date} to {end_date}...")
         
         try:
             response = self.session.get(url, params=params)
             response.raise_for_status()
-            return response.json()
+            return _json.loads(response.content)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching conversations: {e}")
+            logger.error(f"Error fetching conversations: {e}")
             return {}
     
     def get_all_conversations(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
         Get all conversations across all pages.
-        
+
+        Page 1 is fetched first to learn the total count; the remaining
+        pages are then requested concurrently. If the API omits a count,
+        pages are walked sequentially via the 'next' link as before.
+
         Args:
             start_date: Start date in format DD-MM-YYYY
             end_date: End date in format DD-MM-YYYY
-            
+
         Returns:
             List of all conversations
         """
-        all_conversations = []
-        page = 1
-        
-        while True:
-            response = self.get_conversations(start_date, end_date, page)
-            
-            if not response or 'results' not in response:
-                break
-                
-            conversations = response['results']
-            if not conversations:
-                break
-                
-            all_conversations.extend(conversations)
-            print(f"Collected {len(conversations)} conversations from page {page}")
-            
-            # Check if there's a next page
-            if not response.get('next'):
-                break
-                
-            page += 1
-            time.sleep(0.5)  # Be nice to the API
-        
-        print(f"Total conversations collected: {len(all_conversations)}")
+        first_page = self.get_conversations(start_date, end_date, page=1)
+
+        if not first_page or not first_page.get('results'):
+            logger.info("Total conversations collected: 0")
+            return []
+
+        all_conversations = list(first_page['results'])
+        logger.info(f"Collected {len(all_conversations)} conversations from page 1")
+
+        count = first_page.get('count')
+        if count:
+            npages = math.ceil(count / len(all_conversations))
+            if npages > 1:
+                logger.info(f"Fetching pages 2-{npages} concurrently...")
+                pages = asyncio.run(
+                    self._fetch_remaining_pages(start_date, end_date, npages))
+                for response in pages:
+                    if response and 'results' in response:
+                        all_conversations.extend(response['results'])
+        elif first_page.get('next'):
+            # Fall back to sequential paging when the count is missing
+            page = 2
+            response = first_page
+            while response.get('next'):
+                response = self.get_conversations(start_date, end_date, page)
+                if not response or not response.get('results'):
+                    break
+                all_conversations.extend(response['results'])
+                logger.info(f"Collected {len(response['results'])} conversations from page {page}")
+                page += 1
+
+        logger.info(f"Total conversations collected: {len(all_conversations)}")
         return all_conversations
+
+    async def _fetch_remaining_pages(self, start_date: str, end_date: str,
+                                     npages: int) -> List[Dict[str, Any]]:
+        """
+        Fetch conversation pages 2..npages concurrently.
+
+        Args:
+            start_date: Start date in format DD-MM-YYYY
+            end_date: End date in format DD-MM-YYYY
+            npages: Total number of pages reported by the API
+
+        Returns:
+            List of page responses, one per requested page
+        """
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async with self._async_client() as client:
+            return list(await asyncio.gather(
+                *(self._fetch_conversations_page(client, sem, start_date, end_date, page)
+                  for page in range(2, npages + 1))
+            ))
+
+    async def _fetch_conversations_page(self, client: httpx.AsyncClient,
+                                        sem: asyncio.Semaphore, start_date: str,
+                                        end_date: str, page: int) -> Dict[str, Any]:
+        """
+        Get one page of conversations through the shared async client.
+
+        Args:
+            client: Shared httpx.AsyncClient instance
+            sem: Semaphore bounding the number of in-flight requests
+            start_date: Start date in format DD-MM-YYYY
+            end_date: End date in format DD-MM-YYYY
+            page: Page number to fetch
+
+        Returns:
+            JSON response containing conversations
+        """
+        url = f"https://billing.weni.ai/api/v1/{self.project_uuid}/conversations/"
+        params = {
+            'page': page,
+            'start': start_date,
+            'end': end_date
+        }
+
+        try:
+            return await self._get_json(client, sem, url, params)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching conversations page {page}: {e}")
+            return {}
     
-    def get_conversation_messages(self, contact_urn: str, start_time: str) -> Dict[str, Any]:
+    def _async_client(self) -> httpx.AsyncClient:
+        """
+        Build the shared client used for all concurrent fetches.
+
+        HTTP/2 stream multiplexing is used when the h2 extra is
+        installed; otherwise the client speaks HTTP/1.1.
+
+        Returns:
+            Configured httpx.AsyncClient instance
+        """
+        # Connection-specific headers are not allowed on HTTP/2 streams
+        headers = {k: v for k, v in self.session.headers.items() if k.lower() != 'connection'}
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=50)
+        return httpx.AsyncClient(headers=headers, http2=h2 is not None, limits=limits)
+
+    async def _request(self, client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                       url: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        Issue a GET through the shared async client, gated by the semaphore.
+
+        Backs off and retries only when the server answers HTTP 429;
+        other errors propagate to the caller.
+
+        Args:
+            client: Shared httpx.AsyncClient instance
+            sem: Semaphore bounding the number of in-flight requests
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Successful httpx.Response
+        """
+        async with sem:
+            for attempt in range(5):
+                response = await client.get(url, params=params)
+                if response.status_code == 429:
+                    try:
+                        retry_after = float(response.headers.get('retry-after', 1))
+                    except ValueError:
+                        # Retry-After may also be an HTTP-date; fall back
+                        # to the default delay rather than parsing dates
+                        retry_after = 1.0
+                    await asyncio.sleep(retry_after * (attempt + 1))
+                    continue
+                response.raise_for_status()
+                return response
+            response.raise_for_status()
+            return response
+
+    async def _get_json(self, client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                        url: str, params: Dict[str, Any]) -> Any:
+        """
+        Fetch a URL and decode its JSON body.
+
+        Args:
+            client: Shared httpx.AsyncClient instance
+            sem: Semaphore bounding the number of in-flight requests
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Decoded JSON response body
+        """
+        response = await self._request(client, sem, url, params)
+        return _json.loads(response.content)
+
+    async def _fetch_messages(self, client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                              contact_urn: str, start_time: str) -> Dict[str, Any]:
         """
         Get all messages for a specific conversation.
-        
+
         Args:
+            client: Shared httpx.AsyncClient instance
+            sem: Semaphore bounding the number of in-flight requests
             contact_urn: The contact URN from the conversation
             start_time: The conversation start time
-            
+
         Returns:
             JSON response containing messages
         """
-        # URL encode the contact_urn and start_time
-        encoded_urn = urllib.parse.quote(contact_urn, safe='')
-        encoded_start = urllib.parse.quote(start_time, safe='')
-        
         url = f"https://nexus.weni.ai/api/{self.project_uuid}/conversations/"
         params = {
             'start': start_time,
             'contact_urn': contact_urn
         }
-        
+
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching messages for URN {contact_urn}: {e}")
+            return await self._get_json(client, sem, url, params)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching messages for URN {contact_urn}: {e}")
             return {}
-    
-    def get_agent_traces(self, log_id: int) -> List[Dict[str, Any]]:
+
+    async def _fetch_traces(self, client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                            log_id: int) -> bytes:
         """
         Get agent traces for a specific message.
-        
+
+        The raw JSON payload is returned undecoded so the analysis side
+        can stream-parse it; it is also what the cache stores.
+
         Args:
+            client: Shared httpx.AsyncClient instance
+            sem: Semaphore bounding the number of in-flight requests
             log_id: The message ID to get traces for
-            
+
         Returns:
-            List of trace objects
+            Raw JSON bytes of the trace-list response
         """
+        cached = self._trace_cache.execute(
+            'SELECT payload FROM traces WHERE log_id = ?', (log_id,)).fetchone()
+        if cached is not None:
+            return cached[0]
+
         url = "https://nexus.weni.ai/api/agents/traces/"
         params = {
             'project_uuid': self.project_uuid,
             'log_id': log_id
         }
-        
+
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching traces for log_id {log_id}: {e}")
-            return []
+            response = await self._request(client, sem, url, params)
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching traces for log_id {log_id}: {e}")
+            return b''
+
+        payload = response.content
+        self._trace_cache.execute(
+            'INSERT OR REPLACE INTO traces VALUES (?, ?)', (log_id, payload))
+        self._trace_cache.commit()
+        return payload
     
     def analyze_trace(self, trace_obj: Dict[str, Any]) -> None:
         """
         Analyze a single trace object to extract agent and tool invocations.
-        
+
+        This runs once per trace object in the hot path, so the nested
+        lookups collapse into one walk along the precompiled path.
+
         Args:
             trace_obj: Individual trace object from the response
         """
-        if 'trace' not in trace_obj:
+        invocation_input = _walk(trace_obj)
+        if invocation_input is not None:
+            self._analyze_invocation_input(invocation_input)
+
+    def analyze_trace_payload(self, payload: bytes) -> int:
+        """
+        Analyze a raw trace-list response body.
+
+        With simdjson (preferred) or ijson available, only the
+        invocationInput subtrees are materialized from the payload;
+        telemetry and metadata fields the analyzer never reads are
+        skipped entirely.
+
+        Args:
+            payload: Raw JSON bytes of a trace-list response
+
+        Returns:
+            Number of objects analyzed (trace objects with simdjson or
+            the full parse, invocation inputs with ijson); 0 for an
+            empty payload
+        """
+        if not payload:
+            return 0
+
+        if simdjson is not None:
+            analyzed = 0
+            # Intermediate nodes stay lazy proxies; only the terminal
+            # invocationInput subtree is converted to a real dict
+            for trace_obj in _simdjson_parser.parse(payload):
+                analyzed += 1
+                try:
+                    invocation_input = \
+                        trace_obj[_K['trace']][_K['orchestrationTrace']][_K['invocationInput']]
+                except (KeyError, TypeError):
+                    # Missing key, or a non-object value partway down the
+                    # path — skipped, matching _walk and the ijson branch
+                    continue
+                self._analyze_invocation_input(invocation_input.as_dict())
+            return analyzed
+
+        if ijson is not None:
+            analyzed = 0
+            for invocation_input in ijson.items(
+                    io.BytesIO(payload), 'item.trace.orchestrationTrace.invocationInput'):
+                self._analyze_invocation_input(invocation_input)
+                analyzed += 1
+            return analyzed
+
+        traces = _json.loads(payload)
+        for trace_obj in traces:
+            self.analyze_trace(trace_obj)
+        return len(traces)
+
+    def _analyze_invocation_input(self, invocation_input: Dict[str, Any]) -> None:
+        """
+        Record the agent or tool invocation described by one invocationInput.
+
+        Inputs carrying an invocationType are classified with a single
+        dispatch-table probe; only untyped inputs fall back to testing
+        for each schema's subtree.
+
+        Args:
+            invocation_input: The invocationInput subtree of a trace
+        """
+        handler = self._INVOCATION_HANDLERS.get(invocation_input.get(_K['invocationType']))
+        if handler is not None:
+            handler(self, invocation_input)
+        elif not self._extract_agent(invocation_input):
+            self._extract_tool(invocation_input)
+
+    def _extract_agent(self, invocation_input: Dict[str, Any]) -> bool:
+        """
+        Tally the agent collaborator named by this invocation input.
+
+        Args:
+            invocation_input: The invocationInput subtree of a trace
+
+        Returns:
+            True if an agent collaborator invocation was recorded
+        """
+        agent_info = invocation_input.get(_K['agentCollaboratorInvocationInput'])
+        if agent_info is None:
+            return False
+
+        # Interning the extracted name makes every later tally of the same
+        # agent an identity hit, and dedups the strings as a side effect
+        agent_name = sys.intern(agent_info.get(_K['agentCollaboratorName'], 'unknown'))
+        self.agent_invocations[agent_name] += 1
+        return True
+
+    def _extract_tool(self, invocation_input: Dict[str, Any]) -> bool:
+        """
+        Tally the tool call described by this invocation input and spool
+        its detail row.
+
+        Args:
+            invocation_input: The invocationInput subtree of a trace
+
+        Returns:
+            True if a tool invocation was recorded
+        """
+        action_info = invocation_input.get(_K['actionGroupInvocationInput'])
+        if action_info is None:
+            return False
+
+        function_name = sys.intern(action_info.get(_K['function'], 'unknown'))
+        self.tool_invocations[function_name] += 1
+
+        # Collect detailed tool call data for CSV. Parameters travel as
+        # (name, value) pairs; prefixed column names are only built once
+        # per export, not per row
+        tool_call_data = {
+            'function_name': function_name,
+            'action_group_name': action_info.get(_K['actionGroupName'], ''),
+            'execution_type': action_info.get(_K['executionType'], ''),
+            'params': tuple((param.get(_K['name'], ''), param.get(_K['value'], ''))
+                            for param in action_info.get(_K['parameters'], ()))
+        }
+
+        self._write_tool_row(tool_call_data)
+        return True
+
+    # Dispatch table keyed on invocationType, resolved in one dict probe
+    _INVOCATION_HANDLERS = {
+        'AGENT_COLLABORATOR': _extract_agent,
+        'ACTION_GROUP': _extract_tool,
+    }
+
+    def _write_tool_row(self, row: Dict[str, Any]) -> None:
+        """
+        Append one tool-call row to the columnar store.
+
+        Args:
+            row: Dict with the base column values plus a 'params' tuple
+                of (name, value) pairs
+        """
+        if self._stream_writer is not None:
+            # Constant-memory path: the row goes straight to disk and is
+            # not retained; params collapse into one name=value column
+            self._stream_writer.writerow(
+                (row.get('function_name', ''),
+                 row.get('action_group_name', ''),
+                 row.get('execution_type', ''),
+                 ';'.join(f'{name}={value}'
+                          for name, value in row.get('params', ()))))
+            self.tool_row_count += 1
             return
-            
-        trace = trace_obj['trace']
-        
-        # Check for orchestration trace
-        if 'orchestrationTrace' in trace:
-            orch_trace = trace['orchestrationTrace']
-            
-            # Check for agent collaborator invocations
-            if 'invocationInput' in orch_trace:
-                invocation_input = orch_trace['invocationInput']
-                
-                # Agent collaborator invocation
-                if 'agentCollaboratorInvocationInput' in invocation_input:
-                    agent_info = invocation_input['agentCollaboratorInvocationInput']
-                    agent_name = agent_info.get('agentCollaboratorName', 'unknown')
-                    self.agent_invocations[agent_name] += 1
-                
-                # Action group (tool) invocation
-                elif 'actionGroupInvocationInput' in invocation_input:
-                    action_info = invocation_input['actionGroupInvocationInput']
-                    function_name = action_info.get('function', 'unknown')
-                    self.tool_invocations[function_name] += 1
-                    
-                    # Collect detailed tool call data for CSV
-                    tool_call_data = {
-                        'function_name': function_name,
-                        'action_group_name': action_info.get('actionGroupName', ''),
-                        'execution_type': action_info.get('executionType', '')
-                    }
-                    
-                    # Add parameters as separate columns
-                    if 'parameters' in action_info:
-                        for param in action_info['parameters']:
-                            param_name = param.get('name', '')
-                            param_value = param.get('value', '')
-                            tool_call_data[f'param_{param_name}'] = param_value
-                    
-                    self.tool_calls_data.append(tool_call_data)
+
+        for column, values in self._cols.items():
+            values.append(row.get(column, ''))
+
+        # Dedupe repeated param names (last wins, as the old per-row dict
+        # layout did); a double append here would shift the whole column
+        # against the others for every later row
+        for name, value in dict(row.get('params', ())).items():
+            values = self._param_cols.get(name)
+            if values is None:
+                # New param column: pad so it aligns with existing rows
+                values = [None] * self.tool_row_count
+                self._param_cols[name] = values
+            values.append(value)
+
+        # Pad the param columns this row did not touch
+        for values in self._param_cols.values():
+            if len(values) <= self.tool_row_count:
+                values.append(None)
+
+        self.tool_row_count += 1
+
+    def iter_tool_calls(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield tool-call rows reassembled from the columnar store.
+
+        Yields:
+            Dicts in insertion order; each carries a 'params' tuple of
+            (name, value) pairs for the cells this row filled. Empty in
+            streaming mode, where rows are not retained.
+        """
+        for i in range(len(self._cols['function_name'])):
+            row = {column: values[i] for column, values in self._cols.items()}
+            row['params'] = tuple(
+                (name, values[i])
+                for name, values in self._param_cols.items()
+                if values[i] is not None)
+            yield row
     
     def process_conversations(self, start_date: str, end_date: str) -> None:
         """
@@ -248,50 +732,118 @@ class ConversationAnalyzer:
             print("No conversations found for the specified date range.")
             return
         
-        # Step 2: Process each conversation
+        # Step 2: Process all conversations concurrently
         total_conversations = len(conversations)
-        processed_messages = 0
-        
-        for i, conversation in enumerate(conversations, 1):
-            print(f"\nProcessing conversation {i}/{total_conversations} (ID: {conversation['id']})")
-            
-            contact_urn = conversation['urn']
-            created_on = conversation['created_on']
-            
-            # Get messages for this conversation
-            messages_response = self.get_conversation_messages(contact_urn, created_on)
-            
-            if not messages_response or 'results' not in messages_response:
-                print(f"  No messages found for conversation {conversation['id']}")
-                continue
-            
-            messages = messages_response['results']
-            agent_messages = [msg for msg in messages if msg.get('source_type') == 'agent']
-            
-            print(f"  Found {len(messages)} total messages, {len(agent_messages)} agent messages")
-            
-            # Step 3: Process each agent message
-            for j, message in enumerate(agent_messages, 1):
-                message_id = message['id']
-                print(f"    Processing agent message {j}/{len(agent_messages)} (ID: {message_id})")
-                
-                # Get traces for this message
-                traces = self.get_agent_traces(message_id)
-                
-                if traces:
-                    print(f"      Found {len(traces)} trace objects")
-                    for trace_obj in traces:
-                        self.analyze_trace(trace_obj)
-                else:
-                    print(f"      No traces found for message {message_id}")
-                
-                processed_messages += 1
-                time.sleep(0.2)  # Rate limiting
-        
+        processed_messages = asyncio.run(self._process_conversations(conversations))
+
         print(f"\nProcessing complete!")
         print(f"Total conversations processed: {total_conversations}")
         print(f"Total agent messages processed: {processed_messages}")
-    
+
+    async def _process_conversations(self, conversations: List[Dict[str, Any]]) -> int:
+        """
+        Fan out message and trace fetches for all conversations concurrently.
+
+        The backend exposes no bulk traces endpoint, so the per-message
+        calls are coalesced client-side instead: every message fetch goes
+        into one batch and every trace fetch across all conversations into
+        a second, each driven by a single asyncio.gather over the shared
+        HTTP/2 client, whose stream multiplexing carries the whole batch
+        on a handful of connections. All requests are gated by a semaphore
+        so at most MAX_CONCURRENT_REQUESTS are in flight.
+
+        Args:
+            conversations: List of conversation objects to process
+
+        Returns:
+            Number of agent messages processed
+        """
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        total = len(conversations)
+
+        async with self._async_client() as client:
+            # Phase 1: all message fetches in one batch
+            message_responses = await asyncio.gather(
+                *(self._fetch_messages(client, sem, conversation['urn'],
+                                       conversation['created_on'])
+                  for conversation in conversations)
+            )
+
+            # Collect agent messages across every conversation; per-item
+            # status goes to debug so the hot loop stays print-free
+            debug = logger.isEnabledFor(logging.DEBUG)
+            conversation_pairs = zip(conversations, message_responses)
+            if tqdm is not None:
+                conversation_pairs = tqdm(conversation_pairs, total=total,
+                                          desc="Conversations", unit="conv")
+
+            agent_messages = []
+            for index, (conversation, messages_response) in enumerate(conversation_pairs, 1):
+                if debug:
+                    logger.debug(f"Processing conversation {index}/{total} "
+                                 f"(ID: {conversation['id']})")
+
+                if not messages_response or 'results' not in messages_response:
+                    if debug:
+                        logger.debug(f"  No messages found for conversation {conversation['id']}")
+                    continue
+
+                # Filter and collect in one pass, without an intermediate
+                # per-conversation list
+                messages = messages_response['results']
+                n_agent = 0
+                for msg in messages:
+                    if msg.get('source_type') == 'agent':
+                        agent_messages.append(msg)
+                        n_agent += 1
+
+                if debug:
+                    logger.debug(f"  Found {len(messages)} total messages, "
+                                 f"{n_agent} agent messages")
+
+            # Phase 2: all trace fetches in one batch. An interrupted run
+            # is simply re-run: the trace cache answers the fetches that
+            # already completed, so only the remainder hits the network
+            trace_payloads = await asyncio.gather(
+                *(self._fetch_traces(client, sem, message['id'])
+                  for message in agent_messages)
+            )
+
+        message_pairs = zip(agent_messages, trace_payloads)
+        if tqdm is not None:
+            message_pairs = tqdm(message_pairs, total=len(agent_messages),
+                                 desc="Messages", unit="msg")
+
+        for message, payload in message_pairs:
+            if not self.analyze_trace_payload(payload) and debug:
+                logger.debug(f"      No traces found for message {message['id']}")
+
+        return len(agent_messages)
+
+    def _top_invocations(self, invocations: Dict[str, int],
+                         k: int = 10) -> List[Tuple[str, int]]:
+        """
+        Return the k most-invoked names with their counts, descending.
+
+        Uses the JIT-compiled numeric helper when numba/numpy are
+        available; otherwise falls back to a plain Python sort.
+
+        Args:
+            invocations: Mapping of name to invocation count
+            k: Number of entries to return
+
+        Returns:
+            List of (name, count) tuples
+        """
+        if np is None:
+            # itemgetter keeps the sort key at C level
+            return sorted(invocations.items(), key=itemgetter(1), reverse=True)[:k]
+
+        names = list(invocations)
+        counts = np.fromiter(invocations.values(), dtype=np.int64, count=len(names))
+        return [(names[i], int(counts[i]))
+                for i in _topk_indices(counts, min(k, len(names)))]
+
     def generate_statistics(self) -> None:
         """Generate and display statistics."""
         print("\n" + "=" * 60)
@@ -305,6 +857,9 @@ class ConversationAnalyzer:
             for agent_name, count in sorted(self.agent_invocations.items()):
                 print(f"  {agent_name}: {count}")
             print(f"\nTotal agent invocations: {sum(self.agent_invocations.values())}")
+            print("\nTop agents by invocation count:")
+            for agent_name, count in self._top_invocations(self.agent_invocations):
+                print(f"  {agent_name}: {count}")
         else:
             print("  No agent invocations found")
         
@@ -315,67 +870,301 @@ class ConversationAnalyzer:
             for tool_name, count in sorted(self.tool_invocations.items()):
                 print(f"  {tool_name}: {count}")
             print(f"\nTotal tool invocations: {sum(self.tool_invocations.values())}")
+            print("\nTop tools by invocation count:")
+            for tool_name, count in self._top_invocations(self.tool_invocations):
+                print(f"  {tool_name}: {count}")
         else:
             print("  No tool invocations found")
-    
+
+        self._encode_statistics()
+
+    def _encode_statistics(self) -> None:
+        """
+        Serialize the statistics report to JSON bytes, once.
+
+        The encoded buffer is cached on the instance so that
+        save_statistics_to_file writes it verbatim instead of
+        re-serializing (and re-encoding) the same data.
+        """
+        stats = {
+            'agent_invocations': dict(sorted(self.agent_invocations.items())),
+            'total_agent_invocations': sum(self.agent_invocations.values()),
+            'top_agents': self._top_invocations(self.agent_invocations),
+            'tool_invocations': dict(sorted(self.tool_invocations.items())),
+            'total_tool_invocations': sum(self.tool_invocations.values()),
+            'top_tools': self._top_invocations(self.tool_invocations),
+            'tool_call_records': self.tool_row_count,
+        }
+
+        if _json is json:
+            self._stats_bytes = json.dumps(stats, indent=2).encode('utf-8')
+        else:
+            self._stats_bytes = _json.dumps(stats, option=_json.OPT_INDENT_2)
+
     def generate_csv_files(self) -> None:
         """Generate CSV files for tool invocations."""
         print("\nGenerating CSV files...")
-        
-        if not self.tool_calls_data:
+
+        if self._stream_writer is not None:
+            self._stream_file.flush()
+            print(f"Streaming mode: {self.tool_row_count} records already "
+                  f"written to {self._stream_filename}")
+            return
+
+        if not self.tool_row_count:
             print("No tool call data to export.")
             return
-        
-        # Create a DataFrame from tool calls data
-        df = pd.DataFrame(self.tool_calls_data)
-        
+
+        # Stable column order across all chunks and output files
+        columns = self._csv_columns()
+
         # Generate timestamp for unique filenames
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Generate overall tool invocations CSV
+
         overall_filename = f"tool_invocations_{timestamp}.csv"
-        df.to_csv(overall_filename, index=False)
+
+        if pl is not None:
+            tool_filenames = self._export_csv_polars(columns, overall_filename, timestamp)
+        elif pa is not None:
+            tool_filenames = self._export_csv_arrow(columns, overall_filename, timestamp)
+        else:
+            tool_filenames = self._export_csv_stdlib(columns, overall_filename, timestamp)
+
         print(f"Generated overall tool invocations CSV: {overall_filename}")
-        
-        # Generate separate CSV for each tool
-        if 'function_name' in df.columns:
-            unique_tools = df['function_name'].unique()
-            
-            for tool_name in unique_tools:
-                tool_df = df[df['function_name'] == tool_name]
-                tool_filename = f"tool_{tool_name}_{timestamp}.csv"
-                tool_df.to_csv(tool_filename, index=False)
-                print(f"Generated tool-specific CSV: {tool_filename}")
-        
-        print(f"\nTotal tool invocation records exported: {len(df)}")
+        for tool_filename in tool_filenames.values():
+            print(f"Generated tool-specific CSV: {tool_filename}")
+
+        print(f"\nTotal tool invocation records exported: {self.tool_row_count}")
+
+    def _iter_column_chunks(self, columns: List[str],
+                            chunk_rows: int = 50_000) -> Iterator[Dict[str, list]]:
+        """
+        Yield bounded struct-of-arrays slices of the columnar store.
+
+        The slices are taken straight off the stored column lists, so no
+        per-row transposition or dict unification happens here.
+
+        Args:
+            columns: Stable column order for the buffers
+            chunk_rows: Maximum rows per yielded buffer set
+
+        Yields:
+            Dict mapping column name to a list of values for one chunk
+        """
+        all_cols = self._all_columns()
+
+        for start in range(0, self.tool_row_count, chunk_rows):
+            stop = min(start + chunk_rows, self.tool_row_count)
+            yield {column: all_cols[column][start:stop] for column in columns}
+
+    def _export_csv_polars(self, columns: List[str], overall_filename: str,
+                           timestamp: str) -> Dict[str, str]:
+        """
+        CSV export through polars' multithreaded Rust writer.
+
+        Each spool chunk becomes a polars frame appended to the overall
+        file, then split once with partition_by for the per-tool files.
+
+        Args:
+            columns: Stable column order for all output files
+            overall_filename: Path of the combined CSV
+            timestamp: Timestamp suffix for per-tool filenames
+
+        Returns:
+            Mapping of tool name to generated per-tool filename
+        """
+        tool_filenames = {}
+        tool_files = {}
+        first_chunk = True
+
+        with open(overall_filename, 'wb') as overall_file:
+            try:
+                for buffers in self._iter_column_chunks(columns):
+                    frame = pl.DataFrame(
+                        {column: [value if value is None else str(value)
+                                  for value in buffer]
+                         for column, buffer in buffers.items()})
+
+                    frame.write_csv(overall_file, include_header=first_chunk)
+                    first_chunk = False
+
+                    for key, tool_frame in frame.partition_by(
+                            'function_name', as_dict=True).items():
+                        # Recent polars returns 1-tuple partition keys,
+                        # older versions the bare string
+                        tool_name = key[0] if isinstance(key, tuple) else key
+                        tool_file = tool_files.get(tool_name)
+                        if tool_file is None:
+                            tool_filenames[tool_name] = f"tool_{tool_name}_{timestamp}.csv"
+                            tool_file = open(tool_filenames[tool_name], 'wb')
+                            tool_files[tool_name] = tool_file
+                            tool_frame.write_csv(tool_file, include_header=True)
+                        else:
+                            tool_frame.write_csv(tool_file, include_header=False)
+            finally:
+                for tool_file in tool_files.values():
+                    tool_file.close()
+
+        return tool_filenames
+
+    def _export_csv_arrow(self, columns: List[str], overall_filename: str,
+                          timestamp: str) -> Dict[str, str]:
+        """
+        Write the overall and per-tool CSVs through pyarrow.
+
+        Column buffers are wrapped in pa.table directly — no intermediate
+        DataFrame — and serialized by the C++ CSV writer.
+
+        Args:
+            columns: Stable column order for all output files
+            overall_filename: Path of the combined CSV
+            timestamp: Timestamp suffix for per-tool filenames
+
+        Returns:
+            Mapping of tool name to generated per-tool filename
+        """
+        schema = pa.schema([(column, pa.string()) for column in columns])
+        overall_writer = pacsv.CSVWriter(overall_filename, schema)
+        tool_writers = {}
+        tool_filenames = {}
+
+        for buffers in self._iter_column_chunks(columns):
+            table = pa.table(
+                {column: pa.array([value if value is None else str(value)
+                                   for value in buffer], type=pa.string())
+                 for column, buffer in buffers.items()},
+                schema=schema)
+
+            overall_writer.write_table(table)
+
+            function_col = table.column('function_name')
+            for tool_name in function_col.unique().to_pylist():
+                tool_table = table.filter(pc.equal(function_col, tool_name))
+                if tool_name not in tool_writers:
+                    tool_filenames[tool_name] = f"tool_{tool_name}_{timestamp}.csv"
+                    tool_writers[tool_name] = pacsv.CSVWriter(
+                        tool_filenames[tool_name], schema)
+                tool_writers[tool_name].write_table(tool_table)
+
+        overall_writer.close()
+        for writer in tool_writers.values():
+            writer.close()
+
+        return tool_filenames
+
+    def _all_columns(self) -> Dict[str, list]:
+        """
+        Output column mapping for all CSV files.
+
+        The param_ header names are concatenated here, once per export
+        per column, rather than once per row during collection.
+
+        Returns:
+            Dict of output column name to backing column list, base
+            columns first and param columns sorted by name
+        """
+        all_cols = dict(self._cols)
+        for name in sorted(self._param_cols):
+            all_cols[f'param_{name}'] = self._param_cols[name]
+        return all_cols
+
+    def _csv_columns(self) -> List[str]:
+        """
+        Deterministic output schema for all CSV files.
+
+        Returns:
+            Base columns followed by the observed param columns, sorted
+        """
+        return list(self._all_columns())
+
+    def _iter_rows(self, columns: List[str]) -> Iterator[tuple]:
+        """
+        Yield value tuples straight from the columnar store.
+
+        Args:
+            columns: Stable column order for the tuples
+
+        Yields:
+            One tuple per row, with None for empty param cells
+        """
+        all_cols = self._all_columns()
+        column_lists = [all_cols[column] for column in columns]
+
+        for i in range(self.tool_row_count):
+            yield tuple(values[i] for values in column_lists)
+
+    def _export_csv_stdlib(self, columns: List[str], overall_filename: str,
+                           timestamp: str) -> Dict[str, str]:
+        """
+        Fallback CSV export through the csv module when pyarrow is
+        unavailable.
+
+        Files are opened with a 1 MiB buffer and rows go through
+        writerows in batches, so the per-row formatting and the flushes
+        both happen at C level instead of once per Python call.
+
+        Args:
+            columns: Stable column order for all output files
+            overall_filename: Path of the combined CSV
+            timestamp: Timestamp suffix for per-tool filenames
+
+        Returns:
+            Mapping of tool name to generated per-tool filename
+        """
+        with open(overall_filename, 'w', newline='', encoding='utf-8',
+                  buffering=1 << 20) as overall_file:
+            overall_writer = csv.writer(overall_file)
+            overall_writer.writerow(columns)
+            overall_writer.writerows(self._iter_rows(columns))
+
+        tool_filenames = {}
+        tool_files = {}
+        tool_writers = {}
+        tool_buffers = {}
+
+        try:
+            for tool_name, row in zip(self._cols['function_name'],
+                                      self._iter_rows(columns)):
+                writer = tool_writers.get(tool_name)
+                if writer is None:
+                    tool_filenames[tool_name] = f"tool_{tool_name}_{timestamp}.csv"
+                    tool_file = open(tool_filenames[tool_name], 'w', newline='',
+                                     encoding='utf-8', buffering=1 << 20)
+                    tool_files[tool_name] = tool_file
+                    writer = csv.writer(tool_file)
+                    writer.writerow(columns)
+                    tool_writers[tool_name] = writer
+                    tool_buffers[tool_name] = []
+
+                buffer = tool_buffers[tool_name]
+                buffer.append(row)
+                # Hand rows to writerows in slices to bound peak memory
+                if len(buffer) >= 8192:
+                    writer.writerows(buffer)
+                    buffer.clear()
+
+            for tool_name, buffer in tool_buffers.items():
+                if buffer:
+                    tool_writers[tool_name].writerows(buffer)
+        finally:
+            for tool_file in tool_files.values():
+                tool_file.close()
+
+        return tool_filenames
     
     def save_statistics_to_file(self) -> None:
-        """Save statistics to a text file."""
+        """Save statistics to a JSON file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        stats_filename = f"conversation_statistics_{timestamp}.txt"
-        
-        with open(stats_filename, 'w') as f:
-            f.write("CONVERSATION ANALYSIS STATISTICS\n")
-            f.write("=" * 60 + "\n\n")
-            
-            f.write("AGENT INVOCATIONS:\n")
-            f.write("-" * 30 + "\n")
-            if self.agent_invocations:
-                for agent_name, count in sorted(self.agent_invocations.items()):
-                    f.write(f"  {agent_name}: {count}\n")
-                f.write(f"\nTotal agent invocations: {sum(self.agent_invocations.values())}\n")
-            else:
-                f.write("  No agent invocations found\n")
-            
-            f.write("\nTOOL INVOCATIONS:\n")
-            f.write("-" * 30 + "\n")
-            if self.tool_invocations:
-                for tool_name, count in sorted(self.tool_invocations.items()):
-                    f.write(f"  {tool_name}: {count}\n")
-                f.write(f"\nTotal tool invocations: {sum(self.tool_invocations.values())}\n")
-            else:
-                f.write("  No tool invocations found\n")
-        
+        stats_filename = f"conversation_statistics_{timestamp}.json"
+
+        # Reuse the bytes generate_statistics encoded; no second
+        # serialization pass over the tallies
+        if self._stats_bytes is None:
+            self._encode_statistics()
+
+        with open(stats_filename, 'wb') as f:
+            f.write(self._stats_bytes)
+
         print(f"Statistics saved to: {stats_filename}")
 
 
@@ -383,7 +1172,10 @@ def main():
     """Main function to run the conversation analyzer."""
     # Load environment variables from .env file
     load_dotenv()
-    
+
+    # Progress summaries at INFO; per-message detail is available via DEBUG
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     parser = argparse.ArgumentParser(
         description="Analyze conversations and agent traces from Weni AI platform",
         formatter_class=argparse.RawDescriptionHelpFormatter,